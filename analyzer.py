@@ -1,49 +1,185 @@
 """AI-powered content analyzer using Ollama for intelligent file categorization."""
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final, Iterable, Iterator, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
 import json
+import math
+import threading
+
+try:
+    import orjson  # Optional: faster parsing of AI responses
+except ImportError:
+    orjson = None
 
 from scanner import FileInfo
+from cache import AnalysisCache
 from categories import (
     Category, CATEGORIES, CATEGORY_NAMES, CATEGORY_DESCRIPTIONS,
-    get_category_by_extension, get_category_by_keywords, get_fallback_category
+    get_category_by_extension, get_category_by_keywords, get_fallback_category,
+    get_category_key, match_keywords_batch
 )
 from config import Config, DEFAULT_CONFIG
 
 
-@dataclass
+# Bump whenever the prompt templates below change, so cached answers given to
+# the old prompt are no longer served.
+PROMPT_VERSION: Final = 2
+
+# Rule results iter_analyze queues behind a file still waiting on the model; past
+# this, a half-filled batch is sent as is rather than waiting for more AI files
+_MAX_QUEUED_RULE_RESULTS: Final = 4096
+
+# Invariant system prompt shared by every request. It must stay byte-identical
+# across calls so Ollama can reuse the cached prefix instead of re-evaluating it;
+# any edit invalidates that KV cache (and needs a PROMPT_VERSION bump).
+_STATIC_PREFIX: Final = f"""You are a file categorization assistant. Your job is to analyze file information and categorize files into the appropriate category.
+
+**Available Categories:**
+{CATEGORY_DESCRIPTIONS}
+
+Analyze the file name, extension, and content of each file to determine the best category.
+
+You must respond with ONLY a valid JSON object in this exact format:
+{{"results": [{{"idx": 0, "category": "category_name", "confidence": 0.95, "reasoning": "a few words"}}]}}
+
+Return exactly one entry per file, using the idx shown for that file. The category must be one of the valid categories provided. The confidence should be between 0.0 and 1.0."""
+
+
+# Per-request user prompt pieces; only the fields vary between calls
+_BATCH_HEADER: Final = "Categorize each of these files based on its information:"
+_BATCH_FOOTER: Final = "Respond with JSON only, with one result for each of the {count} files."
+_FILE_TEMPLATE: Final = """[{idx}]
+**File Name:** {name}
+**Extension:** {ext}
+**Size:** {size:.2f} MB
+**MIME Type:** {mime}
+
+**Content Preview:**
+```
+{preview}
+```"""
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of analyzing a file."""
     file_info: FileInfo
-    category: Category
+    category_key: str  # Key into CATEGORIES
     confidence: float  # 0.0 to 1.0
     reasoning: str
     method: str  # 'ai', 'extension', 'keyword', 'fallback'
 
+    @property
+    def category(self) -> Category:
+        return CATEGORIES[self.category_key]
+
+
+@dataclass
+class _PendingBatch:
+    """Files collected for one AI request, and the request once submitted."""
+    files: list[FileInfo] = field(default_factory=list)
+    future: Optional[Future] = None
+
 
 class FileAnalyzer:
-    """Analyzes files using Ollama LLM for intelligent categorization."""
+    """
+    Analyzes files using Ollama LLM for intelligent categorization.
+
+    Safe to share across threads: the Ollama client is created once under a
+    lock and its httpx connection pool is sized to ``config.ollama_concurrency``,
+    so parallel batches reuse keep-alive connections instead of opening new ones.
+    """
 
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, cache_path: Optional[Path] = None):
         self.config = config or DEFAULT_CONFIG
+        self._cache = AnalysisCache(cache_path) if cache_path else None
         self._client = None
         self._ollama_available = None
+        self._client_lock = threading.Lock()
+
+        # Connection reuse counters, fed by httpx request/trace hooks
+        self._stats_lock = threading.Lock()
+        self._requests_sent = 0
+        self._connections_opened = 0
+        self._prompt_tokens = 0  # Summed prompt_eval_count from Ollama replies
 
     def _get_client(self):
-        """Lazy load Ollama client."""
-        if self._client is None:
-            try:
-                import ollama
-                self._client = ollama.Client(host=self.config.ollama_host)
-                # Test connection
-                self._client.list()
-                self._ollama_available = True
-            except Exception as e:
-                self._ollama_available = False
-                self._client = False
+        """Lazy load Ollama client (thread-safe)."""
+        with self._client_lock:
+            if self._client is None:
+                try:
+                    import httpx
+                    import ollama
+                    # One pooled keep-alive connection per concurrent request
+                    workers = max(1, self.config.ollama_concurrency)
+                    self._client = ollama.Client(
+                        host=self.config.ollama_host,
+                        timeout=httpx.Timeout(300.0, connect=10.0),
+                        limits=httpx.Limits(
+                            max_keepalive_connections=workers,
+                            max_connections=workers,
+                            keepalive_expiry=30.0
+                        ),
+                        headers={"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"},
+                        event_hooks={"request": [self._on_request]}
+                    )
+                    # Test connection
+                    self._client.list()
+                    self._ollama_available = True
+                    if self.config.ollama_warmup:
+                        # Prefetch in the background so model loading overlaps local work
+                        threading.Thread(target=self._warm_up, daemon=True).start()
+                except Exception as e:
+                    self._ollama_available = False
+                    self._client = False
         return self._client if self._client else None
 
+    def _on_request(self, request):
+        """Count outgoing requests and trace whether each one opens a new connection."""
+        request.extensions["trace"] = self._on_trace
+        with self._stats_lock:
+            self._requests_sent += 1
+
+    def _on_trace(self, event_name: str, info: dict):
+        """httpcore trace callback; a TCP connect means the pool had no idle connection."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self._connections_opened += 1
+
+    @property
+    def requests_sent(self) -> int:
+        """Number of HTTP requests sent to Ollama."""
+        return self._requests_sent
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Prompt tokens Ollama evaluated across batch requests (prefix-cache hits excluded)."""
+        return self._prompt_tokens
+
+    @property
+    def connection_reuse_rate(self) -> float:
+        """Fraction of Ollama requests served over an already-open connection."""
+        with self._stats_lock:
+            if not self._requests_sent:
+                return 0.0
+            return 1.0 - self._connections_opened / self._requests_sent
+
+    def _warm_up(self):
+        """Load the model and prefill the static prompt prefix so later requests reuse its KV state."""
+        try:
+            self._client.chat(
+                model=self.config.ollama_model,
+                messages=[{"role": "system", "content": _STATIC_PREFIX}],
+                options={"num_predict": 1, "num_ctx": self.config.ollama_num_ctx},
+                keep_alive=self.config.ollama_keep_alive
+            )
+        except Exception:
+            pass  # Warmup is best-effort; real requests will still work
+
     @property
     def ollama_available(self) -> bool:
         """Check if Ollama is available."""
@@ -56,34 +192,59 @@ class FileAnalyzer:
         Analyze a single file and determine its category.
 
         Uses a cascading approach:
-        1. Try AI analysis if content is available and Ollama is running
-        2. Fall back to extension-based classification
-        3. Fall back to keyword-based classification
-        4. Finally use the misc category
+        1. Use the extension match directly when ``config.prefer_rules_over_ai``
+           is set and the extension is not in ``config.ai_only_extensions``
+        2. Try AI analysis if content is available and Ollama is running
+        3. Fall back to extension-based classification
+        4. Fall back to keyword-based classification
+        5. Finally use the misc category
         """
-        # Try AI analysis if we have content
-        if file_info.content and self.ollama_available:
+        if self._needs_ai(file_info):
             result = self._analyze_with_ai(file_info)
             if result:
                 return result
 
+        return self._analyze_with_rules(file_info)
+
+    def _needs_ai(self, file_info: FileInfo) -> bool:
+        """Check whether a file should be sent to Ollama instead of the rules."""
+        if not file_info.content or not self.ollama_available:
+            return False
+
+        # A known extension is already a confident answer; skip the LLM call
+        if self.config.prefer_rules_over_ai and file_info.extension not in self.config.ai_only_extensions:
+            return get_category_by_extension(file_info.extension) is None
+
+        return True
+
+    def _analyze_with_rules(self, file_info: FileInfo) -> AnalysisResult:
+        """Classify a file by extension, then keywords, then the misc category."""
         # Fall back to extension-based classification
         category = get_category_by_extension(file_info.extension)
         if category:
-            return AnalysisResult(
-                file_info=file_info,
-                category=category,
-                confidence=0.9,
-                reasoning=f"Matched by file extension: {file_info.extension}",
-                method="extension"
-            )
+            return self._extension_result(file_info, category)
 
         # Fall back to keyword-based classification
-        category = get_category_by_keywords(file_info.name)
+        return self._keyword_result(file_info, get_category_by_keywords(file_info.name))
+
+    @staticmethod
+    def _extension_result(file_info: FileInfo, category: Category) -> AnalysisResult:
+        """Result for a file matched by its extension."""
+        return AnalysisResult(
+            file_info=file_info,
+            category_key=get_category_key(category),
+            confidence=0.9,
+            reasoning=f"Matched by file extension: {file_info.extension}",
+            method="extension"
+        )
+
+    @staticmethod
+    def _keyword_result(file_info: FileInfo, category: Optional[Category]) -> AnalysisResult:
+        """Result for a file matched by filename keywords, or the fallback if none matched."""
         if category:
             return AnalysisResult(
                 file_info=file_info,
-                category=category,
+                category_key=get_category_key(category),
                 confidence=0.7,
                 reasoning=f"Matched by filename keywords",
                 method="keyword"
@@ -92,7 +253,7 @@ class FileAnalyzer:
         # Final fallback
         return AnalysisResult(
             file_info=file_info,
-            category=get_fallback_category(),
+            category_key=get_category_key(get_fallback_category()),
             confidence=0.3,
             reasoning="No matching category found, using fallback",
             method="fallback"
@@ -100,79 +261,171 @@ class FileAnalyzer:
 
     def _analyze_with_ai(self, file_info: FileInfo) -> Optional[AnalysisResult]:
         """Use Ollama to analyze file content and categorize."""
+        return self._analyze_batch_with_ai([file_info]).get(0)
+
+    def _analyze_batch_with_ai(self, files: list[FileInfo]) -> dict[int, AnalysisResult]:
+        """
+        Categorize several files with a single Ollama request.
+
+        Returns:
+            Mapping of batch index to result; files the model skipped are absent
+        """
         client = self._get_client()
-        if not client:
-            return None
+        if not client or not files:
+            return {}
+
+        # A cache that failed once stays off; classify without it rather than abort
+        if not self._cache or not self._cache.enabled:
+            return self._query_batch(client, files)
+
+        # Serve repeated files from the cache and only send the misses to Ollama
+        results = {}
+        namespace = f"{self.config.ollama_model}/v{PROMPT_VERSION}/{self.config.classify_chars}"
+        keys = [
+            AnalysisCache.make_key(f.content[:self.config.max_content_chars], f.extension, namespace)
+            for f in files
+        ]
+        misses = []
+        for idx, (file_info, key) in enumerate(zip(files, keys)):
+            cached = self._cache.get(key)
+            # Rows written before confidences were validated may hold NULL; treat them as misses
+            if (cached and cached[0] in CATEGORIES
+                    and isinstance(cached[1], float) and math.isfinite(cached[1])):
+                category_key, confidence, reasoning, method = cached
+                results[idx] = AnalysisResult(
+                    file_info=file_info,
+                    category_key=category_key,
+                    confidence=confidence,
+                    reasoning=reasoning,
+                    method=method
+                )
+            else:
+                misses.append(idx)
+
+        if misses:
+            fresh = self._query_batch(client, [files[idx] for idx in misses])
+            entries = []
+            for miss_idx, result in fresh.items():
+                idx = misses[miss_idx]
+                results[idx] = result
+                entries.append((keys[idx], result.category_key,
+                                result.confidence, result.reasoning, result.method))
+            self._cache.put_many(entries)
+
+        return results
 
-        prompt = self._build_prompt(file_info)
+    def _query_batch(self, client, files: list[FileInfo]) -> dict[int, AnalysisResult]:
+        """Send one batch request to Ollama and parse the answer."""
+        response_text = self._chat(client, files)
+        if response_text is None:
+            return {}
+
+        results = self._parse_batch_response(files, response_text)
+        if results or len(files) == 1:
+            return results
+
+        # The whole batch answer was unusable; ask about each file on its own
+        for idx, file_info in enumerate(files):
+            response_text = self._chat(client, [file_info])
+            if response_text is not None:
+                result = self._parse_batch_response([file_info], response_text).get(0)
+                if result:
+                    results[idx] = result
+        return results
+
+    def _chat(self, client, files: list[FileInfo]) -> Optional[str]:
+        """Send the prompt for a batch to Ollama and return the raw reply, or None on failure."""
+        prompt = self._build_batch_prompt(files)
 
         try:
             response = client.chat(
                 model=self.config.ollama_model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a file categorization assistant. Your job is to analyze file information and categorize files into the appropriate category.
-
-You must respond with ONLY a valid JSON object in this exact format:
-{"category": "category_name", "confidence": 0.95, "reasoning": "brief explanation"}
-
-The category must be one of the valid categories provided. The confidence should be between 0.0 and 1.0."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
+                    {"role": "system", "content": _STATIC_PREFIX},
+                    {"role": "user", "content": prompt}
                 ],
+                format="json",  # Constrained decoding: the reply is always bare JSON
                 options={
                     "temperature": 0.1,  # Low temperature for consistent results
-                    "num_predict": 200   # Short response
-                }
+                    "num_predict": self.config.ai_tokens_per_file * len(files),  # Short response per file
+                    "num_ctx": self.config.ollama_num_ctx
+                },
+                keep_alive=self.config.ollama_keep_alive
             )
-
-            # Parse the response
-            response_text = response['message']['content'].strip()
-            return self._parse_ai_response(file_info, response_text)
+            with self._stats_lock:
+                self._prompt_tokens += response.get('prompt_eval_count') or 0
+            return response['message']['content'].strip()
 
         except Exception as e:
             return None
 
-    def _build_prompt(self, file_info: FileInfo) -> str:
-        """Build the prompt for AI analysis."""
-        content_preview = file_info.content[:2000] if file_info.content else "No content available"
-
-        return f"""Categorize this file based on its information:
-
-**File Name:** {file_info.name}
-**Extension:** {file_info.extension}
-**Size:** {file_info.size_mb:.2f} MB
-**MIME Type:** {file_info.mime_type or 'Unknown'}
-
-**Content Preview:**
-```
-{content_preview}
-```
+    def _build_batch_prompt(self, files: list[FileInfo]) -> str:
+        """Build the per-request part of the prompt listing every file in the batch."""
+        # A short head is enough to classify; split the content budget across the batch
+        preview_chars = max(1, min(self.config.classify_chars, self.config.max_content_chars // len(files)))
+
+        entries = [
+            _FILE_TEMPLATE.format(
+                idx=idx,
+                name=file_info.name,
+                ext=file_info.extension,
+                size=file_info.size_mb,
+                mime=file_info.mime_type or 'Unknown',
+                preview=self._preview(file_info.content, preview_chars) if file_info.content else "No content available"
+            )
+            for idx, file_info in enumerate(files)
+        ]
+        return "\n\n".join([_BATCH_HEADER, *entries, _BATCH_FOOTER.format(count=len(files))])
+
+    @staticmethod
+    def _preview(content: str, chars: int) -> str:
+        """Collapse whitespace runs (indentation, blank lines) so the preview spends tokens on text."""
+        return " ".join(content[:chars * 2].split())[:chars]
+
+    def _parse_batch_response(self, files: list[FileInfo], response: str) -> dict[int, AnalysisResult]:
+        """Parse a batch AI response into results keyed by batch index."""
+        # Requests use format="json", so the reply is the JSON document itself
+        try:
+            data = (orjson.loads if orjson else json.loads)(response)
+        except json.JSONDecodeError:
+            return {}
+
+        if isinstance(data, dict):
+            # Tolerate a bare single-file answer when only one file was sent
+            items = data.get('results', [data] if len(files) == 1 else [])
+        else:
+            items = data if isinstance(data, list) else []
+        if not isinstance(items, list):
+            return {}  # e.g. {"results": null}
+
+        results = {}
+        for position, item in enumerate(items):
+            try:
+                idx = int(item.get('idx', position))
+            except (AttributeError, TypeError, ValueError, OverflowError):  # e.g. "idx": 1e400
+                continue
+            if idx in results or not 0 <= idx < len(files):
+                continue
 
-**Available Categories:**
-{CATEGORY_DESCRIPTIONS}
+            result = self._parse_ai_response(files[idx], item)
+            if result:
+                results[idx] = result
 
-Analyze the file name, extension, and content to determine the best category. Respond with JSON only."""
+        return results
 
-    def _parse_ai_response(self, file_info: FileInfo, response: str) -> Optional[AnalysisResult]:
-        """Parse the AI response and create an AnalysisResult."""
+    def _parse_ai_response(self, file_info: FileInfo, data: dict) -> Optional[AnalysisResult]:
+        """Validate a single decoded AI answer and create an AnalysisResult."""
         try:
-            # Try to extract JSON from the response
-            # Handle cases where the model wraps JSON in markdown
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0]
-
-            data = json.loads(response.strip())
-
-            category_name = data.get('category', '').lower()
-            confidence = float(data.get('confidence', 0.8))
-            reasoning = data.get('reasoning', 'AI classification')
+            category = data.get('category', '')
+            confidence = data.get('confidence', 0.8)
+            # The model's JSON is untrusted: only scalars may reach the result (and the cache)
+            if not isinstance(category, str) or not category or isinstance(confidence, (bool, list, dict)):
+                return None
+            category_name = category.lower()
+            confidence = float(confidence)
+            if not math.isfinite(confidence):
+                return None  # "nan"/NaN would be stored as NULL and break the next run
+            reasoning = str(data.get('reasoning', 'AI classification'))
 
             # Validate category
             if category_name not in CATEGORIES:
@@ -186,25 +439,181 @@ Analyze the file name, extension, and content to determine the best category. Re
 
             return AnalysisResult(
                 file_info=file_info,
-                category=CATEGORIES[category_name],
-                confidence=min(confidence, 1.0),
+                category_key=category_name,
+                confidence=min(max(confidence, 0.0), 1.0),
                 reasoning=reasoning,
                 method="ai"
             )
-        except (json.JSONDecodeError, KeyError, ValueError):
+        except (AttributeError, KeyError, ValueError, TypeError):
             return None
 
+    def close(self):
+        """Flush and close the analysis cache, if one is open."""
+        if self._cache:
+            self._cache.close()
+
+    def analyze_batch(self, files: list[FileInfo], batch_size: Optional[int] = None) -> list[AnalysisResult]:
+        """
+        Analyze files in chunks of ``batch_size``, one Ollama request per chunk.
+
+        Files that don't need the model, and any the model fails to answer
+        for, get the rule-based result. Results are returned in input order.
+
+        Args:
+            files: Files to analyze
+            batch_size: Files per request (default: ``config.batch_size``)
+        """
+        batch_size = max(1, batch_size or self.config.batch_size)
+        results = []
+
+        for start in range(0, len(files), batch_size):
+            chunk = files[start:start + batch_size]
+            ai_slots = [i for i, file_info in enumerate(chunk) if self._needs_ai(file_info)]
+            answers = self._analyze_batch_with_ai([chunk[i] for i in ai_slots]) if ai_slots else {}
+            answered = {ai_slots[idx]: result for idx, result in answers.items()}
+            results.extend(
+                answered.get(i) or self._analyze_with_rules(file_info)
+                for i, file_info in enumerate(chunk)
+            )
+
+        return results
+
+    def iter_analyze(self, files: Iterable[FileInfo], release_content: bool = True) -> Iterator[AnalysisResult]:
+        """
+        Analyze files as a stream, yielding results in input order.
+
+        Files with content are sent to Ollama in batches of ``config.batch_size``,
+        with up to ``config.ollama_concurrency`` batches in flight at once;
+        everything else, and any file the model fails to answer for, is
+        classified by the rule-based cascade. Results are held back only while
+        an earlier file awaits the model, and that backlog is bounded: at most
+        a few batches of AI files plus ``_MAX_QUEUED_RULE_RESULTS`` rule
+        results, so memory stays flat however many files stream in.
+
+        Args:
+            files: Files to analyze (any iterable, consumed lazily)
+            release_content: Drop ``file_info.content`` once a result is yielded
+        """
+        batch_size = max(1, self.config.batch_size)
+        workers = max(1, self.config.ollama_concurrency)
+        max_in_flight = 2 * workers
+        max_pending_ai = max_in_flight * batch_size
+        max_slots = max_pending_ai + _MAX_QUEUED_RULE_RESULTS
+
+        # Each slot is a finished result or a (batch, index) still waiting on the model
+        slots: deque = deque()
+        filling: Optional[_PendingBatch] = None
+        in_flight = 0
+        pending_ai = 0  # AI slots not yet yielded; rule slots don't count, or they'd starve the batches
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit(batch: _PendingBatch):
+                nonlocal in_flight
+                batch.future = executor.submit(self._analyze_batch_with_ai, batch.files)
+                in_flight += 1
+
+            def drain(flush: bool) -> Iterator[AnalysisResult]:
+                nonlocal filling, in_flight, pending_ai
+                while slots:
+                    head = slots[0]
+                    if isinstance(head, tuple):
+                        batch, idx = head
+                        must_wait = (flush or in_flight > max_in_flight
+                                     or pending_ai > max_pending_ai or len(slots) > max_slots)
+                        if batch.future is None:
+                            if not must_wait:
+                                break
+                            submit(batch)  # Don't let a half-full batch hold up the stream
+                            filling = None
+                        elif not (must_wait or batch.future.done()):
+                            break
+                        try:
+                            answers = batch.future.result()
+                        except Exception:
+                            answers = {}  # One failed batch falls back to the rules, not the whole run
+                        ai_result = answers.get(idx)
+                        if idx == len(batch.files) - 1:
+                            in_flight -= 1
+                        pending_ai -= 1
+                        result = ai_result or self._analyze_with_rules(batch.files[idx])
+                    else:
+                        result = head
+                    slots.popleft()
+                    yield result
+                    if release_content:
+                        result.file_info.content = None
+
+            for file_info in files:
+                if self._needs_ai(file_info):
+                    if filling is None:
+                        filling = _PendingBatch()
+                    slots.append((filling, len(filling.files)))
+                    filling.files.append(file_info)
+                    pending_ai += 1
+                    if len(filling.files) >= batch_size:
+                        submit(filling)
+                        filling = None
+                else:
+                    slots.append(self._analyze_with_rules(file_info))
+                yield from drain(flush=False)
+
+            yield from drain(flush=True)
+
     def analyze_files(self, files: list[FileInfo], progress_callback=None) -> list[AnalysisResult]:
-        """Analyze multiple files."""
+        """Analyze multiple files, keeping their content; see iter_analyze."""
         results = []
         total = len(files)
 
-        for i, file_info in enumerate(files):
-            result = self.analyze_file(file_info)
+        for i, result in enumerate(self.iter_analyze(files, release_content=False)):
             results.append(result)
 
             if progress_callback:
-                progress_callback(i + 1, total, file_info.name)
+                progress_callback(i + 1, total, result.file_info.name)
+
+        return results
+
+    async def analyze_files_async(self, files: list[FileInfo]) -> list[AnalysisResult]:
+        """
+        Async form of analyze_files for callers already running an event loop.
+
+        The whole list goes through iter_analyze in one worker thread, so it
+        keeps the batching and the bounded window, with at most
+        ``config.ollama_concurrency`` requests in flight over the pooled
+        client. Await this once for many files; gathering per-file calls
+        would send one unbatched request each.
+        """
+        return await asyncio.to_thread(self.analyze_files, files)
+
+    def analyze_files_bulk(self, files: list[FileInfo]) -> list[AnalysisResult]:
+        """
+        Analyze many files at once, resolving the rule-based path in bulk.
+
+        Gives the same results as analyze_file on each file. Extension matches
+        come from one pass over the extension index, every remaining name is
+        keyword-matched in a single match_keywords_batch call, and only files
+        that need the model go through the AI batches of iter_analyze.
+        """
+        results: list[Optional[AnalysisResult]] = [None] * len(files)
+        ai_slots = []
+        keyword_slots = []
+
+        for i, file_info in enumerate(files):
+            if self._needs_ai(file_info):
+                ai_slots.append(i)
+                continue
+            category = get_category_by_extension(file_info.extension)
+            if category:
+                results[i] = self._extension_result(file_info, category)
+            else:
+                keyword_slots.append(i)
+
+        keyword_matches = match_keywords_batch([files[i].name for i in keyword_slots])
+        for i, category in zip(keyword_slots, keyword_matches):
+            results[i] = self._keyword_result(files[i], category)
+
+        ai_results = self.iter_analyze((files[i] for i in ai_slots), release_content=False)
+        for i, result in zip(ai_slots, ai_results):
+            results[i] = result
 
         return results
 
@@ -0,0 +1,162 @@
+"""On-disk caches: AI classifications by content fingerprint, and scanned file details by path."""
+
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+import hashlib
+import os
+import sqlite3
+import threading
+
+
+def _storable(value):
+    """
+    Make a str safe to bind: SQLite only takes valid UTF-8, which lone surrogates
+    (from PDF text, JSON escapes or undecodable file names) are not.
+
+    Unencodable code points are kept as backslash escapes, so distinct values stay distinct.
+    """
+    if isinstance(value, str):
+        try:
+            value.encode('utf-8')
+        except UnicodeEncodeError:
+            return value.encode('utf-8', 'surrogatepass').decode('utf-8', 'backslashreplace')
+    return value
+
+
+class _SQLiteCache:
+    """
+    Best-effort SQLite store shared by the caches.
+
+    A cache only ever saves work, so the first database or filesystem error
+    disables it: lookups miss and writes are dropped from then on.
+    """
+
+    _SCHEMA = ""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.enabled = True
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Lazily open the database, creating it on first use."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(self._SCHEMA)
+        return self._conn
+
+    def _run(self, operation: Callable[[sqlite3.Connection], Any], default: Any = None) -> Any:
+        """Run ``operation(conn)`` under the lock; on failure disable the cache and return ``default``."""
+        with self._lock:
+            if not self.enabled:
+                return default
+            try:
+                return operation(self._get_conn())
+            except (OSError, sqlite3.Error, UnicodeError):
+                self.enabled = False
+                self._close_conn()
+                return default
+
+    def _close_conn(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def close(self):
+        """Flush and close the database."""
+        with self._lock:
+            self._close_conn()
+
+
+class AnalysisCache(_SQLiteCache):
+    """SQLite-backed map from a content fingerprint to a stored classification."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS analysis ("
+        "key TEXT PRIMARY KEY, category TEXT, confidence REAL, reasoning TEXT, method TEXT)"
+    )
+
+    @staticmethod
+    def make_key(content: str, extension: str, namespace: str = "") -> str:
+        """Fingerprint a file by its content preview and extension, scoped to a namespace (model + prompt)."""
+        digest = hashlib.sha256()
+        for part in (content, extension, namespace):
+            digest.update(part.encode('utf-8', errors='ignore'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[tuple[str, float, str, str]]:
+        """Return the cached (category_key, confidence, reasoning, method), if any."""
+        row = self._run(lambda conn: conn.execute(
+            "SELECT category, confidence, reasoning, method FROM analysis WHERE key = ?",
+            (key,)
+        ).fetchone())
+        return tuple(row) if row else None
+
+    def put_many(self, entries: list[tuple[str, str, float, str, str]]):
+        """Store (key, category_key, confidence, reasoning, method) rows in one transaction."""
+        if not entries:
+            return
+
+        def write(conn):
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analysis (key, category, confidence, reasoning, method) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (tuple(map(_storable, entry)) for entry in entries)
+                )
+        self._run(write)
+
+
+class ScanCache(_SQLiteCache):
+    """SQLite-backed map from a file path to what a previous scan read from it, valid while mtime and size match."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS scan ("
+        "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, content TEXT, mime TEXT, chars INTEGER)"
+    )
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[tuple[Optional[str], Optional[str], Optional[int]]]:
+        """Return the cached (content, mime_type, chars) if the file is unchanged, else None."""
+        row = self._run(lambda conn: conn.execute(
+            "SELECT content, mime, chars FROM scan WHERE path = ? AND mtime = ? AND size = ?",
+            (_storable(path), mtime_ns, size)
+        ).fetchone())
+        return tuple(row) if row else None
+
+    def put_many(self, entries: list[tuple[str, int, int, Optional[str], Optional[str], Optional[int]]]):
+        """Store (path, mtime_ns, size, content, mime_type, chars) rows in one transaction."""
+        if not entries:
+            return
+
+        def write(conn):
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO scan (path, mtime, size, content, mime, chars) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (tuple(map(_storable, entry)) for entry in entries)
+                )
+        self._run(write)
+
+    def prune(self, root: str, seen: Iterable[str]):
+        """Drop rows under ``root`` for files a full scan of it no longer found (moved, deleted or now skipped)."""
+        root = _storable(root)
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+
+        def delete(conn):
+            with conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (path TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM seen")
+                conn.executemany("INSERT OR IGNORE INTO seen (path) VALUES (?)", ((_storable(p),) for p in seen))
+                conn.execute(
+                    "DELETE FROM scan WHERE path >= ? AND path < ? AND path NOT IN (SELECT path FROM seen)",
+                    (prefix, upper)
+                )
+                conn.execute("DELETE FROM seen")
+        self._run(delete)
@@ -1,22 +1,20 @@
 """Category definitions and rule-based classification for the AI File Organizer."""
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Final, Optional
 from pathlib import Path
+import re
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Category:
     """Represents a file category."""
     name: str
     path: str  # Relative path in organized structure
     description: str
-    extensions: set[str] = None  # File extensions that match this category
-    keywords: set[str] = None  # Keywords in filename that match
-
-    def __post_init__(self):
-        self.extensions = self.extensions or set()
-        self.keywords = self.keywords or set()
+    extensions: frozenset[str] = frozenset()  # File extensions that match this category
+    keywords: frozenset[str] = frozenset()  # Keywords in filename that match
 
 
 # Default category hierarchy
@@ -26,43 +24,43 @@ CATEGORIES = {
         name="Work Documents",
         path="Documents/Work",
         description="Work-related documents, reports, presentations",
-        extensions={'.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.odt', '.ods', '.odp'},
-        keywords={'report', 'meeting', 'project', 'proposal', 'invoice', 'contract', 'agenda', 'memo'}
+        extensions=frozenset({'.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.odt', '.ods', '.odp'}),
+        keywords=frozenset({'report', 'meeting', 'project', 'proposal', 'invoice', 'contract', 'agenda', 'memo'})
     ),
     "personal": Category(
         name="Personal Documents",
         path="Documents/Personal",
         description="Personal documents, letters, notes",
-        extensions=set(),
-        keywords={'personal', 'diary', 'journal', 'letter', 'note', 'todo', 'list'}
+        extensions=frozenset(),
+        keywords=frozenset({'personal', 'diary', 'journal', 'letter', 'note', 'todo', 'list'})
     ),
     "financial": Category(
         name="Financial Documents",
         path="Documents/Financial",
         description="Financial records, receipts, tax documents",
-        extensions=set(),
-        keywords={'tax', 'receipt', 'invoice', 'bank', 'statement', 'budget', 'expense', 'payment', 'salary'}
+        extensions=frozenset(),
+        keywords=frozenset({'tax', 'receipt', 'invoice', 'bank', 'statement', 'budget', 'expense', 'payment', 'salary'})
     ),
     "legal": Category(
         name="Legal Documents",
         path="Documents/Legal",
         description="Legal documents, contracts, agreements",
-        extensions=set(),
-        keywords={'legal', 'contract', 'agreement', 'license', 'terms', 'policy', 'nda', 'court', 'law'}
+        extensions=frozenset(),
+        keywords=frozenset({'legal', 'contract', 'agreement', 'license', 'terms', 'policy', 'nda', 'court', 'law'})
     ),
     "ebooks": Category(
         name="eBooks",
         path="Documents/eBooks",
         description="Electronic books and publications",
-        extensions={'.epub', '.mobi', '.azw', '.azw3'},
-        keywords={'ebook', 'book', 'novel', 'guide', 'manual'}
+        extensions=frozenset({'.epub', '.mobi', '.azw', '.azw3'}),
+        keywords=frozenset({'ebook', 'book', 'novel', 'guide', 'manual'})
     ),
     "pdf": Category(
         name="PDFs",
         path="Documents/PDFs",
         description="PDF documents",
-        extensions={'.pdf'},
-        keywords=set()
+        extensions=frozenset({'.pdf'}),
+        keywords=frozenset()
     ),
 
     # Code
@@ -70,43 +68,43 @@ CATEGORIES = {
         name="Python Code",
         path="Code/Python",
         description="Python source files",
-        extensions={'.py', '.pyw', '.pyx', '.pxd', '.pyi'},
-        keywords=set()
+        extensions=frozenset({'.py', '.pyw', '.pyx', '.pxd', '.pyi'}),
+        keywords=frozenset()
     ),
     "javascript": Category(
         name="JavaScript Code",
         path="Code/JavaScript",
         description="JavaScript and TypeScript files",
-        extensions={'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'},
-        keywords=set()
+        extensions=frozenset({'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'}),
+        keywords=frozenset()
     ),
     "web": Category(
         name="Web Files",
         path="Code/Web",
         description="HTML, CSS, and web assets",
-        extensions={'.html', '.htm', '.css', '.scss', '.sass', '.less', '.svg'},
-        keywords=set()
+        extensions=frozenset({'.html', '.htm', '.css', '.scss', '.sass', '.less', '.svg'}),
+        keywords=frozenset()
     ),
     "code_other": Category(
         name="Other Code",
         path="Code/Other",
         description="Other programming languages",
-        extensions={
+        extensions=frozenset({
             '.java', '.c', '.cpp', '.h', '.hpp', '.cs', '.go', '.rs', '.rb',
             '.php', '.swift', '.kt', '.scala', '.r', '.m', '.mm', '.sql',
             '.sh', '.bash', '.zsh', '.ps1', '.bat', '.cmd'
-        },
-        keywords=set()
+        }),
+        keywords=frozenset()
     ),
     "config": Category(
         name="Config Files",
         path="Code/Config",
         description="Configuration and settings files",
-        extensions={
+        extensions=frozenset({
             '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf',
             '.env', '.properties', '.xml'
-        },
-        keywords={'config', 'settings', 'preferences'}
+        }),
+        keywords=frozenset({'config', 'settings', 'preferences'})
     ),
 
     # Media
@@ -114,29 +112,29 @@ CATEGORIES = {
         name="Photos",
         path="Media/Photos",
         description="Image files and photographs",
-        extensions={'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic', '.heif', '.raw', '.cr2', '.nef', '.arw'},
-        keywords={'photo', 'image', 'picture', 'screenshot', 'img', 'pic'}
+        extensions=frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic', '.heif', '.raw', '.cr2', '.nef', '.arw'}),
+        keywords=frozenset({'photo', 'image', 'picture', 'screenshot', 'img', 'pic'})
     ),
     "videos": Category(
         name="Videos",
         path="Media/Videos",
         description="Video files",
-        extensions={'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpeg', '.mpg', '.3gp'},
-        keywords={'video', 'movie', 'clip', 'recording'}
+        extensions=frozenset({'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpeg', '.mpg', '.3gp'}),
+        keywords=frozenset({'video', 'movie', 'clip', 'recording'})
     ),
     "music": Category(
         name="Music",
         path="Media/Music",
         description="Audio and music files",
-        extensions={'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', '.aiff', '.alac'},
-        keywords={'music', 'song', 'audio', 'track', 'podcast'}
+        extensions=frozenset({'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', '.aiff', '.alac'}),
+        keywords=frozenset({'music', 'song', 'audio', 'track', 'podcast'})
     ),
     "graphics": Category(
         name="Graphics",
         path="Media/Graphics",
         description="Design and graphics files",
-        extensions={'.psd', '.ai', '.eps', '.indd', '.sketch', '.fig', '.xd', '.afdesign', '.afphoto'},
-        keywords={'design', 'graphic', 'logo', 'icon', 'banner'}
+        extensions=frozenset({'.psd', '.ai', '.eps', '.indd', '.sketch', '.fig', '.xd', '.afdesign', '.afphoto'}),
+        keywords=frozenset({'design', 'graphic', 'logo', 'icon', 'banner'})
     ),
 
     # Archives
@@ -144,8 +142,8 @@ CATEGORIES = {
         name="Archives",
         path="Archives",
         description="Compressed files and archives",
-        extensions={'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.tgz', '.tbz2'},
-        keywords={'backup', 'archive'}
+        extensions=frozenset({'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.tgz', '.tbz2'}),
+        keywords=frozenset({'backup', 'archive'})
     ),
 
     # Data
@@ -153,8 +151,8 @@ CATEGORIES = {
         name="Data Files",
         path="Data",
         description="Data files, spreadsheets, databases",
-        extensions={'.csv', '.tsv', '.parquet', '.sqlite', '.db', '.mdb', '.accdb'},
-        keywords={'data', 'dataset', 'export', 'import'}
+        extensions=frozenset({'.csv', '.tsv', '.parquet', '.sqlite', '.db', '.mdb', '.accdb'}),
+        keywords=frozenset({'data', 'dataset', 'export', 'import'})
     ),
 
     # Applications
@@ -162,8 +160,8 @@ CATEGORIES = {
         name="Installers",
         path="Applications/Installers",
         description="Application installers and packages",
-        extensions={'.dmg', '.pkg', '.msi', '.exe', '.deb', '.rpm', '.appimage', '.snap'},
-        keywords={'install', 'setup', 'installer'}
+        extensions=frozenset({'.dmg', '.pkg', '.msi', '.exe', '.deb', '.rpm', '.appimage', '.snap'}),
+        keywords=frozenset({'install', 'setup', 'installer'})
     ),
 
     # Misc
@@ -171,29 +169,140 @@ CATEGORIES = {
         name="Miscellaneous",
         path="Misc",
         description="Uncategorized files",
-        extensions=set(),
-        keywords=set()
+        extensions=frozenset(),
+        keywords=frozenset()
     )
 }
 
 
+# Lookup tables built once from CATEGORIES. When an extension or keyword is
+# shared, the category defined first wins, same as a scan in definition order.
+_EXT_INDEX: dict[str, Category] = {}
+_KEYWORD_INDEX: dict[str, Category] = {}
+_KEYWORD_RANK: dict[str, int] = {}
+_KEY_BY_NAME: dict[str, str] = {}
+for _rank, (_key, _category) in enumerate(CATEGORIES.items()):
+    _KEY_BY_NAME[_category.name] = _key
+    for _ext in _category.extensions:
+        _EXT_INDEX.setdefault(_ext, _category)
+    for _keyword in _category.keywords:
+        _KEYWORD_INDEX.setdefault(_keyword, _category)
+        _KEYWORD_RANK.setdefault(_keyword, _rank)
+
+# A zero-width lookahead is tried at every position, so overlapping keywords are
+# all reported; alternatives are ordered by category rank so that, at any one
+# position, the keyword of the earliest category is the one reported.
+_KEYWORDS_BY_RANK = sorted(_KEYWORD_RANK, key=lambda k: (_KEYWORD_RANK[k], -len(k), k))
+_KEYWORD_RE = re.compile("(?=({}))".format("|".join(map(re.escape, _KEYWORDS_BY_RANK))))
+
+# Importing numba and loading the compiled kernel costs ~0.5s up front (more on the first,
+# compiling run); the per-name regex only falls behind at about this many names
+_BATCH_JIT_THRESHOLD = 100_000
+_keyword_matcher = None  # Lazily compiled (kernel, tables); False when numba is missing
+_prange = range  # Rebound to numba.prange before the kernel is compiled
+
+
+@lru_cache(maxsize=256)
 def get_category_by_extension(extension: str) -> Optional[Category]:
     """Get category based on file extension."""
-    ext = extension.lower()
-    for category in CATEGORIES.values():
-        if ext in category.extensions:
-            return category
-    return None
+    return _EXT_INDEX.get(extension.lower())
 
 
 def get_category_by_keywords(filename: str) -> Optional[Category]:
     """Get category based on filename keywords."""
-    name_lower = filename.lower()
-    for category in CATEGORIES.values():
-        for keyword in category.keywords:
-            if keyword in name_lower:
-                return category
-    return None
+    return _match_keywords(filename.lower())
+
+
+@lru_cache(maxsize=4096)
+def _match_keywords(name_lower: str) -> Optional[Category]:
+    """Keyword scan of an already-lowercased filename (memoized for repeated names)."""
+    matches = _KEYWORD_RE.findall(name_lower)
+    if not matches:
+        return None
+    return _KEYWORD_INDEX[min(matches, key=_KEYWORD_RANK.__getitem__)]
+
+
+def _match_keywords_kernel(hay, name_offsets, blob, kw_offsets, kw_ranks, kw_skip, out):
+    """
+    For each name in ``hay``, store the rank of the first category whose
+    keyword it contains, or -1. Each keyword is found with a
+    Boyer-Moore-Horspool search using its row of ``kw_skip``. Names are
+    independent, so the outer loop runs in parallel once compiled.
+    """
+    for i in _prange(len(name_offsets) - 1):
+        start = name_offsets[i]
+        end = name_offsets[i + 1]
+        out[i] = -1
+        # Keywords are sorted by category rank, so the first hit is the answer
+        for k in range(len(kw_offsets) - 1):
+            kw_start = kw_offsets[k]
+            m = kw_offsets[k + 1] - kw_start
+            pos = start
+            found = False
+            while pos + m <= end:
+                j = m - 1
+                while j >= 0 and hay[pos + j] == blob[kw_start + j]:
+                    j -= 1
+                if j < 0:
+                    found = True
+                    break
+                pos += kw_skip[k, hay[pos + m - 1]]
+            if found:
+                out[i] = kw_ranks[k]
+                break
+
+
+def _get_keyword_matcher():
+    """Lazy load the numba-compiled keyword matcher and its lookup tables."""
+    global _keyword_matcher, _prange
+    if _keyword_matcher is None:
+        try:
+            import numpy as np
+            from numba import njit, prange
+        except ImportError:
+            _keyword_matcher = False
+        else:
+            encoded = [keyword.encode('utf-8') for keyword in _KEYWORDS_BY_RANK]
+            kw_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            kw_offsets[1:] = np.cumsum([len(e) for e in encoded])
+            kw_skip = np.empty((len(encoded), 256), dtype=np.int64)
+            for k, keyword in enumerate(encoded):
+                kw_skip[k, :] = len(keyword)
+                for j, byte in enumerate(keyword[:-1]):
+                    kw_skip[k, byte] = len(keyword) - 1 - j
+
+            tables = (
+                np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                kw_offsets,
+                np.array([_KEYWORD_RANK[keyword] for keyword in _KEYWORDS_BY_RANK], dtype=np.int64),
+                kw_skip
+            )
+            _prange = prange
+            _keyword_matcher = (njit(cache=True, parallel=True)(_match_keywords_kernel), np, tables)
+    return _keyword_matcher or None
+
+
+def match_keywords_batch(filenames: list[str]) -> list[Optional[Category]]:
+    """
+    Keyword-match many filenames at once.
+
+    Same result as calling get_category_by_keywords on each name, but large
+    batches run through a single numba-compiled pass when numba is installed.
+    """
+    matcher = _get_keyword_matcher() if len(filenames) >= _BATCH_JIT_THRESHOLD else None
+    if not matcher:
+        return [get_category_by_keywords(name) for name in filenames]
+
+    kernel, np, tables = matcher
+    encoded = [name.lower().encode('utf-8') for name in filenames]
+    name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    name_offsets[1:] = np.cumsum([len(e) for e in encoded])
+    hay = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    ranks = np.empty(len(encoded), dtype=np.int64)
+
+    kernel(hay, name_offsets, *tables, ranks)
+    categories = list(CATEGORIES.values())
+    return [categories[rank] if rank >= 0 else None for rank in ranks.tolist()]
 
 
 def get_fallback_category() -> Category:
@@ -211,9 +320,14 @@ def get_category_by_name(name: str) -> Optional[Category]:
     return CATEGORIES.get(name.lower())
 
 
+def get_category_key(category: Category) -> str:
+    """Get the key name of a category."""
+    return _KEY_BY_NAME[category.name]
+
+
 # Category names for AI prompt
 CATEGORY_NAMES = list(CATEGORIES.keys())
-CATEGORY_DESCRIPTIONS = "\n".join(
+CATEGORY_DESCRIPTIONS: Final = "\n".join(
     f"- {key}: {cat.description} (path: {cat.path})"
     for key, cat in CATEGORIES.items()
 )
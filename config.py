@@ -13,54 +13,96 @@ class Config:
     # Ollama settings
     ollama_model: str = "llama3.2"
     ollama_host: str = "http://localhost:11434"
+    ollama_keep_alive: str = "30m"  # Keep model + prompt cache loaded between files
+    ollama_num_ctx: int = 4096  # Context window requested from Ollama
+    ollama_concurrency: int = 4  # Parallel requests in flight to Ollama
+    ollama_warmup: bool = True  # Preload the model and system prompt on connect
 
     # Processing settings
     max_file_size_mb: int = 50  # Skip files larger than this
-    max_content_chars: int = 4000  # Max chars to send to LLM
+    max_content_chars: int = 4000  # Max chars of content kept per file
+    classify_chars: int = 1024  # Max chars of that content put in the prompt per file
+    content_preview_only: bool = True  # Scanner reads at most max_content_chars per file
     batch_size: int = 10  # Files to process in batch
+    ai_tokens_per_file: int = 64  # Response token budget per file in a batch
 
     # File types to read content from
-    text_extensions: set = field(default_factory=lambda: {
+    text_extensions: frozenset[str] = field(default_factory=lambda: frozenset({
         '.txt', '.md', '.rst', '.json', '.yaml', '.yml', '.xml', '.csv',
         '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h',
         '.go', '.rs', '.rb', '.php', '.html', '.css', '.scss', '.sql',
         '.sh', '.bash', '.zsh', '.ps1', '.bat', '.cmd',
         '.ini', '.cfg', '.conf', '.toml', '.env', '.gitignore',
         '.dockerfile', '.makefile'
-    })
+    }))
 
     # File types to skip entirely
-    skip_extensions: set = field(default_factory=lambda: {
+    skip_extensions: frozenset[str] = field(default_factory=lambda: frozenset({
         '.exe', '.dll', '.so', '.dylib', '.bin',
         '.iso', '.dmg', '.img',
         '.lock', '.log'
-    })
+    }))
+
+    # Trust a known extension over the LLM; only these extensions still go to AI
+    prefer_rules_over_ai: bool = True
+    ai_only_extensions: frozenset[str] = field(default_factory=lambda: frozenset({'.txt', '.md'}))
 
     # Output settings
     output_dir_name: str = "Organized"
     undo_log_file: str = "undo_log.json"
 
+    # Cache settings (shared across runs and output directories)
+    use_cache: bool = True
+    cache_dir: str = "~/.cache/desktoporganizer"
+    analyzer_cache_file: str = "llm.db"
+    scan_cache_file: str = "scan.db"
+
+    @property
+    def analyzer_cache_path(self) -> Path:
+        """Location of the AI classification cache."""
+        return Path(self.cache_dir).expanduser() / self.analyzer_cache_file
+
+    @property
+    def scan_cache_path(self) -> Path:
+        """Location of the cache of scanned file contents and MIME types."""
+        return Path(self.cache_dir).expanduser() / self.scan_cache_file
+
     def to_dict(self) -> dict:
         """Convert config to dictionary."""
         return {
             'ollama_model': self.ollama_model,
             'ollama_host': self.ollama_host,
+            'ollama_keep_alive': self.ollama_keep_alive,
+            'ollama_num_ctx': self.ollama_num_ctx,
+            'ollama_concurrency': self.ollama_concurrency,
+            'ollama_warmup': self.ollama_warmup,
             'max_file_size_mb': self.max_file_size_mb,
             'max_content_chars': self.max_content_chars,
+            'classify_chars': self.classify_chars,
+            'content_preview_only': self.content_preview_only,
             'batch_size': self.batch_size,
+            'ai_tokens_per_file': self.ai_tokens_per_file,
             'text_extensions': list(self.text_extensions),
             'skip_extensions': list(self.skip_extensions),
+            'prefer_rules_over_ai': self.prefer_rules_over_ai,
+            'ai_only_extensions': list(self.ai_only_extensions),
             'output_dir_name': self.output_dir_name,
-            'undo_log_file': self.undo_log_file
+            'undo_log_file': self.undo_log_file,
+            'use_cache': self.use_cache,
+            'cache_dir': self.cache_dir,
+            'analyzer_cache_file': self.analyzer_cache_file,
+            'scan_cache_file': self.scan_cache_file
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Config':
         """Create config from dictionary."""
         if 'text_extensions' in data:
-            data['text_extensions'] = set(data['text_extensions'])
+            data['text_extensions'] = frozenset(data['text_extensions'])
         if 'skip_extensions' in data:
-            data['skip_extensions'] = set(data['skip_extensions'])
+            data['skip_extensions'] = frozenset(data['skip_extensions'])
+        if 'ai_only_extensions' in data:
+            data['ai_only_extensions'] = frozenset(data['ai_only_extensions'])
         return cls(**data)
 
     def save(self, path: Path) -> None:
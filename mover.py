@@ -2,15 +2,55 @@
 
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Optional
-from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import errno
+import itertools
 import json
+import os
 import shutil
+import threading
+import time
+
+try:
+    import orjson  # Optional: much faster (de)serialization of the undo log
+except ImportError:
+    orjson = None
 
 from analyzer import AnalysisResult
 from config import Config, DEFAULT_CONFIG
 
 
+def _json_dumps(data, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _ns_to_iso(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as a local ISO string."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return (datetime.fromtimestamp(seconds) + timedelta(microseconds=remainder // 1000)).isoformat()
+
+
+def _iso_to_ns(value: str) -> int:
+    """Parse an ISO timestamp (as written by older undo logs) to epoch nanoseconds."""
+    dt = datetime.fromisoformat(value)
+    return (int(dt.replace(microsecond=0).timestamp()) * 1_000_000 + dt.microsecond) * 1000
+
+
+# os.rename replaces an existing target on POSIX, the only platforms that take dir fds
+_RENAME_DIR_FD = os.rename in os.supports_dir_fd
+
+
 @dataclass
 class MoveOperation:
     """Represents a single file move operation."""
@@ -18,13 +58,18 @@ class MoveOperation:
     destination: str
     category: str
     reasoning: str
-    timestamp: str
+    timestamp: int  # Nanoseconds since the epoch; formatted as ISO only on export
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        data = asdict(self)
+        data['timestamp'] = _ns_to_iso(self.timestamp)
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> 'MoveOperation':
+        data = dict(data)
+        if isinstance(data['timestamp'], str):
+            data['timestamp'] = _iso_to_ns(data['timestamp'])
         return cls(**data)
 
 
@@ -62,32 +107,65 @@ class OrganizationSession:
 
 
 class UndoLog:
-    """Manages the undo log for reversing organization operations."""
+    """
+    Manages the undo log for reversing organization operations.
+
+    The log is a JSON snapshot of all sessions plus an append-only JSONL
+    journal (same name, ``.jsonl`` suffix) holding operations added since the
+    last snapshot. Each move appends one line; session-level events rewrite
+    the snapshot and empty the journal.
+    """
 
     def __init__(self, log_path: Path):
         self.log_path = log_path
+        self.journal_path = log_path.with_suffix('.jsonl')
         self._sessions: list[OrganizationSession] = []
+        self._journal = None  # Opened lazily on the first operation
         self._load()
 
     def _load(self):
-        """Load existing sessions from the log file."""
+        """Load existing sessions from the log file and replay the journal."""
         if self.log_path.exists():
             try:
-                with open(self.log_path, 'r') as f:
-                    data = json.load(f)
-                    self._sessions = [OrganizationSession.from_dict(s) for s in data.get('sessions', [])]
+                data = _json_loads(self.log_path.read_bytes())
+                self._sessions = [OrganizationSession.from_dict(s) for s in data.get('sessions', [])]
             except (json.JSONDecodeError, KeyError):
                 self._sessions = []
 
+        if self.journal_path.exists():
+            sessions = {s.session_id: s for s in self._sessions}
+            seen = {(s.session_id, op.destination) for s in self._sessions for op in s.operations}
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        data = _json_loads(line)
+                        session = sessions[data.pop('sid')]
+                        operation = MoveOperation.from_dict(data)
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue  # Torn line from an interrupted write
+                    # Skip entries already folded into the snapshot
+                    if (session.session_id, operation.destination) not in seen:
+                        seen.add((session.session_id, operation.destination))
+                        session.operations.append(operation)
+
     def _save(self):
-        """Save sessions to the log file."""
+        """Save sessions to the log file and empty the journal."""
         # Ensure parent directory exists
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         data = {
             'sessions': [s.to_dict() for s in self._sessions]
         }
-        with open(self.log_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.log_path.write_bytes(_json_dumps(data, indent=True))
+
+        # Every journaled operation is now part of the snapshot
+        self.close()
+        self.journal_path.unlink(missing_ok=True)
+
+    def close(self):
+        """Close the journal file, if open."""
+        if self._journal:
+            self._journal.close()
+            self._journal = None
 
     def create_session(self, source_dir: str, output_dir: str) -> OrganizationSession:
         """Create a new organization session."""
@@ -104,9 +182,12 @@ class UndoLog:
         return session
 
     def add_operation(self, session: OrganizationSession, operation: MoveOperation):
-        """Add an operation to a session."""
+        """Add an operation to a session; appends a single line to the journal."""
         session.operations.append(operation)
-        self._save()
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, 'ab', buffering=0)
+        self._journal.write(_json_dumps({'sid': session.session_id, **operation.to_dict()}) + b'\n')
 
     def complete_session(self, session: OrganizationSession):
         """Mark a session as complete."""
@@ -136,8 +217,74 @@ class FileMover:
         self.undo_log = UndoLog(self.output_dir / self.config.undo_log_file)
         self._current_session: Optional[OrganizationSession] = None
 
+        # Shared state for concurrent moves
+        self._created_dirs: set[Path] = set()
+        # Open descriptors for created category dirs, so renames resolve only the leaf name
+        self._dir_fds: dict[Path, int] = {}
+        # Names (casefolded, for case-insensitive filesystems) taken or claimed per destination dir
+        self._dir_listing: dict[Path, set[str]] = {}
+        self._next_suffix: dict[tuple[Path, str, str], int] = {}
+        self._path_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._same_device = False  # Source and output on one filesystem (rename fast path)
+        # Operation timestamps: session start plus a microsecond per op, so they stay strictly ordered
+        self._session_start_ns = time.time_ns()
+        self._op_index = itertools.count()
+
+    @staticmethod
+    def _device_of(path: Path) -> Optional[int]:
+        """Get the device id of a path, or of its nearest existing parent."""
+        for candidate in (path, *path.parents):
+            try:
+                return candidate.stat().st_dev
+            except OSError:
+                continue
+        return None
+
+    def _check_same_device(self, source_dir: Path, output_dir: Path) -> bool:
+        """Check whether moves between two directories can be plain renames."""
+        device = self._device_of(Path(source_dir))
+        return device is not None and device == self._device_of(Path(output_dir))
+
+    def _open_dir_fd(self, directory: Path):
+        """Keep a descriptor for a destination dir, where the platform can rename relative to one."""
+        if not (self._same_device and _RENAME_DIR_FD):
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except OSError:
+            return
+        # Another thread may have opened it first; keep one descriptor per dir
+        if self._dir_fds.setdefault(directory, fd) != fd:
+            os.close(fd)
+
+    def _close_dir_fds(self):
+        """Release the descriptors held for destination dirs."""
+        for fd in self._dir_fds.values():
+            os.close(fd)
+        self._dir_fds.clear()
+
+    def _move(self, source: Path, dest: Path):
+        """Move a file, using a single rename when both ends share a filesystem."""
+        if self._same_device:
+            try:
+                dir_fd = self._dir_fds.get(dest.parent)
+                if dir_fd is not None:
+                    os.rename(source, dest.name, dst_dir_fd=dir_fd)  # renameat(2)
+                else:
+                    os.replace(source, dest)
+                return
+            except OSError as e:
+                # A subdirectory may still be a different mount; copy it over instead
+                if e.errno != errno.EXDEV:
+                    raise
+        shutil.move(str(source), str(dest))
+
     def start_session(self, source_dir: Path):
         """Start a new organization session."""
+        self._same_device = self._check_same_device(source_dir, self.output_dir)
+        self._session_start_ns = time.time_ns()
+        self._op_index = itertools.count()
         if not self.dry_run:
             self._current_session = self.undo_log.create_session(
                 str(source_dir),
@@ -146,6 +293,7 @@ class FileMover:
 
     def end_session(self):
         """End the current organization session."""
+        self._close_dir_fds()
         if self._current_session and not self.dry_run:
             self.undo_log.complete_session(self._current_session)
 
@@ -161,51 +309,81 @@ class FileMover:
         dest_dir = self.output_dir / category_path
         dest_file = dest_dir / source.name
 
-        # Handle filename collisions
-        dest_file = self._get_unique_path(dest_file)
+        # Handle filename collisions; claim the name so concurrent moves can't pick it too
+        with self._path_lock:
+            dest_file = self._get_unique_path(dest_file)
+            self._listing(dest_dir).add(dest_file.name.casefold())
 
         operation = MoveOperation(
             source=str(source),
             destination=str(dest_file),
             category=result.category.name,
             reasoning=result.reasoning,
-            timestamp=datetime.now().isoformat()
+            timestamp=self._session_start_ns + next(self._op_index) * 1000
         )
 
         if not self.dry_run:
             try:
-                # Create destination directory
-                dest_dir.mkdir(parents=True, exist_ok=True)
+                # Create destination directory (once per session)
+                if dest_dir not in self._created_dirs:
+                    dest_dir.mkdir(parents=True, exist_ok=True)
+                    self._open_dir_fd(dest_dir)
+                    self._created_dirs.add(dest_dir)
 
                 # Move the file
-                shutil.move(str(source), str(dest_file))
+                self._move(source, dest_file)
 
                 # Log the operation
                 if self._current_session:
-                    self.undo_log.add_operation(self._current_session, operation)
+                    with self._log_lock:
+                        self.undo_log.add_operation(self._current_session, operation)
             except PermissionError:
+                self._release_path(dest_file)
                 return None  # Skip files we can't move
             except OSError:
+                self._release_path(dest_file)
                 return None  # Skip other OS errors
 
         return operation
 
+    def _listing(self, directory: Path) -> set[str]:
+        """Get the names in a destination directory, listing it only on first use."""
+        names = self._dir_listing.get(directory)
+        if names is None:
+            try:
+                names = {entry.name.casefold() for entry in os.scandir(directory)}
+            except OSError:
+                names = set()  # Not created yet
+            self._dir_listing[directory] = names
+        return names
+
+    def _release_path(self, path: Path):
+        """Give back a destination name claimed by a move that failed."""
+        with self._path_lock:
+            self._listing(path.parent).discard(path.name.casefold())
+
+    def _is_taken(self, path: Path) -> bool:
+        """Check whether a destination already exists or is claimed by another move."""
+        return path.name.casefold() in self._listing(path.parent)
+
     def _get_unique_path(self, path: Path) -> Path:
         """Get a unique file path, handling collisions."""
-        if not path.exists():
+        if not self._is_taken(path):
             return path
 
         stem = path.stem
         suffix = path.suffix
         parent = path.parent
-        counter = 1
+        # Resume after the last suffix handed out for this name
+        counter = self._next_suffix.get((parent, stem, suffix), 1)
 
         while True:
             new_name = f"{stem}_{counter}{suffix}"
             new_path = parent / new_name
-            if not new_path.exists():
-                return new_path
             counter += 1
+            if not self._is_taken(new_path):
+                self._next_suffix[(parent, stem, suffix)] = counter
+                return new_path
 
     def undo_last_session(self) -> tuple[bool, str, list[tuple[str, str]]]:
         """
@@ -220,6 +398,7 @@ class FileMover:
 
         moves = []
         errors = []
+        self._same_device = self._check_same_device(Path(session.source_directory), Path(session.output_directory))
 
         for operation in reversed(session.operations):
             source = Path(operation.source)
@@ -231,7 +410,7 @@ class FileMover:
                     source.parent.mkdir(parents=True, exist_ok=True)
 
                     # Move file back
-                    shutil.move(str(dest), str(source))
+                    self._move(dest, source)
                     moves.append((str(dest), str(source)))
                 except Exception as e:
                     errors.append(f"Failed to restore {dest.name}: {e}")
@@ -249,39 +428,52 @@ class FileMover:
         return True, f"Successfully undid {len(moves)} file moves", moves
 
     def _cleanup_empty_dirs(self, directory: Path):
-        """Remove empty directories recursively."""
-        if not directory.exists():
-            return
+        """Remove empty directories, deepest first."""
+        for root, dirs, files in os.walk(directory, topdown=False):
+            # Don't delete the root output directory
+            if Path(root) == self.output_dir:
+                continue
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass  # Not empty
 
-        for child in directory.iterdir():
-            if child.is_dir():
-                self._cleanup_empty_dirs(child)
+    def iter_organize(self, results: Iterable[AnalysisResult]) -> Iterator[Optional[MoveOperation]]:
+        """
+        Move analyzed files as they stream in, yielding operations in input order.
 
-        # Check if directory is empty now
-        try:
-            if directory.exists() and not any(directory.iterdir()):
-                # Don't delete the root output directory
-                if directory != self.output_dir:
-                    directory.rmdir()
-        except OSError:
-            pass
+        Moves are syscall-bound, so a thread pool overlaps them; only a bounded
+        window of results is held at a time. Failed moves yield None.
+        """
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        pending: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in results:
+                pending.append(executor.submit(self.move_file, result))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
 
     def organize_files(self, results: list[AnalysisResult], progress_callback=None) -> list[MoveOperation]:
         """
         Organize all analyzed files.
 
+        Files are moved concurrently; operations are returned in input order.
+
         Args:
             results: List of analysis results
             progress_callback: Optional callback(current, total, filename)
 
         Returns:
-            List of move operations performed
+            List of move operations performed (None for files that failed)
         """
         operations = []
         total = len(results)
 
-        for i, result in enumerate(results):
-            operation = self.move_file(result)
+        for i, (result, operation) in enumerate(zip(results, self.iter_organize(results))):
             operations.append(operation)
 
             if progress_callback:
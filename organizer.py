@@ -7,8 +7,11 @@ file contents and organize them into meaningful categories.
 """
 
 import argparse
+import os
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 from rich.console import Console
 from rich.table import Table
@@ -18,14 +21,49 @@ from rich.text import Text
 from rich import box
 
 from config import Config, DEFAULT_CONFIG
-from scanner import FileScanner, FileInfo
+from scanner import FileScanner, FileInfo, CollectedPaths
 from analyzer import FileAnalyzer, AnalysisResult
 from mover import FileMover, MoveOperation
-from categories import get_all_categories
+from categories import CATEGORIES, get_all_categories
 
 
 console = Console()
 
+# Minimum seconds between progress bar updates (~20 Hz)
+PROGRESS_INTERVAL = 0.05
+
+# Larger plans show only this many rows from each end of the table
+PLAN_MAX_ROWS = 500
+PLAN_EDGE_ROWS = 50
+
+
+class _ProgressThrottle:
+    """Coalesce per-file progress ticks into at most one update per interval."""
+
+    def __init__(self, progress: Progress, task, interval: float = PROGRESS_INTERVAL):
+        self.progress = progress
+        self.task = task
+        self.interval = interval
+        self._pending = 0
+        self._description = None
+        self._last_update = time.monotonic()
+
+    def tick(self, description: str, advance: int = 1):
+        """Record progress, updating the bar only if the interval has elapsed."""
+        self._pending += advance
+        self._description = description
+        now = time.monotonic()
+        if now - self._last_update >= self.interval:
+            self.flush()
+            self._last_update = now
+
+    def flush(self):
+        """Apply any progress recorded since the last update."""
+        if self._description is not None:
+            self.progress.update(self.task, advance=self._pending, description=self._description)
+            self._pending = 0
+            self._description = None
+
 
 def print_banner():
     """Print the application banner."""
@@ -52,8 +90,8 @@ def scan_files(source_dir: Path, config: Config, recursive: bool = True) -> list
     """Scan directory for files."""
     console.print(f"\n[bold]Scanning:[/bold] {source_dir}" + (" (recursive)" if recursive else " (top-level only)"))
 
-    scanner = FileScanner(config)
-    files = []
+    scanner = FileScanner(config, cache_path=config.scan_cache_path if config.use_cache else None)
+    collected = CollectedPaths()
 
     with Progress(
         SpinnerColumn(),
@@ -61,17 +99,25 @@ def scan_files(source_dir: Path, config: Config, recursive: bool = True) -> list
         console=console
     ) as progress:
         task = progress.add_task("Discovering files...", total=None)
-        for file_info in scanner.scan_directory(source_dir, recursive=recursive):
-            files.append(file_info)
-            progress.update(task, description=f"Found {len(files)} files...")
+        throttle = _ProgressThrottle(progress, task)
+        for file_info in scanner.scan_directory(source_dir, recursive=recursive, defer_pdf=True):
+            collected.add(file_info)
+            throttle.tick(f"Found {collected.count} files...", advance=0)
+        throttle.flush()
+
+        progress.update(task, description="Extracting PDF text...")
+        scanner.extract_pdf_contents(collected.files)
+        scanner.close()
 
-    console.print(f"[green]Found {len(files)} files to organize[/green]\n")
-    return files
+    total_mb = collected.total_bytes / (1024 * 1024)
+    console.print(f"[green]Found {collected.count} files to organize ({total_mb:.1f} MB)[/green]\n")
+    return collected.files
 
 
-def analyze_files(files: list[FileInfo], config: Config, fast_mode: bool = False) -> list[AnalysisResult]:
+def analyze_files(files: list[FileInfo], config: Config, fast_mode: bool = False,
+                  cache_path: Optional[Path] = None) -> list[AnalysisResult]:
     """Analyze files and determine categories."""
-    analyzer = FileAnalyzer(config)
+    analyzer = FileAnalyzer(config, cache_path=cache_path)
 
     # Check Ollama status
     if fast_mode:
@@ -82,8 +128,6 @@ def analyze_files(files: list[FileInfo], config: Config, fast_mode: bool = False
     else:
         console.print("[yellow]Ollama not available[/yellow] - using rule-based classification")
 
-    results = []
-
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -93,10 +137,20 @@ def analyze_files(files: list[FileInfo], config: Config, fast_mode: bool = False
     ) as progress:
         task = progress.add_task("Analyzing files...", total=len(files))
 
-        for file_info in files:
-            result = analyzer.analyze_file(file_info)
-            results.append(result)
-            progress.update(task, advance=1, description=f"Analyzing: {file_info.name[:40]}...")
+        if analyzer.ollama_available:
+            # Stream results so each file's content preview is released once analyzed
+            results = []
+            throttle = _ProgressThrottle(progress, task)
+            for result in analyzer.iter_analyze(files):
+                results.append(result)
+                throttle.tick(f"Analyzing: {result.file_info.name[:40]}...")
+            throttle.flush()
+        else:
+            # Rules only: classify everything in one bulk pass
+            results = analyzer.analyze_files_bulk(files)
+            progress.update(task, completed=len(files))
+
+    analyzer.close()
 
     # Summary of analysis methods
     methods = {}
@@ -109,6 +163,11 @@ def analyze_files(files: list[FileInfo], config: Config, fast_mode: bool = False
                 "keyword": "[yellow]Key[/yellow]", "fallback": "[red]Fallback[/red]"}.get(method, method)
         console.print(f"  {icon}: {count} files")
 
+    if analyzer.requests_sent:
+        console.print(f"  [dim]Ollama requests: {analyzer.requests_sent} "
+                      f"({analyzer.connection_reuse_rate:.0%} on reused connections), "
+                      f"{analyzer.prompt_tokens} prompt tokens[/dim]")
+
     return results
 
 
@@ -121,18 +180,35 @@ def display_plan(results: list[AnalysisResult], output_dir: Path):
     table.add_column("Method", style="dim")
     table.add_column("Confidence", justify="right")
 
-    for result in results:
-        dest_path = output_dir / result.category.path / result.file_info.name
+    # Category name and destination prefix (relative to output_dir), built once per category
+    category_columns = {
+        key: (category.name, str(Path(category.path)) + os.sep)
+        for key, category in CATEGORIES.items()
+    }
+
+    def add_row(result: AnalysisResult):
+        category_name, dest_prefix = category_columns[result.category_key]
         conf_style = "green" if result.confidence >= 0.8 else "yellow" if result.confidence >= 0.5 else "red"
 
         table.add_row(
             result.file_info.name,
-            result.category.name,
-            str(dest_path.relative_to(output_dir)),
+            category_name,
+            dest_prefix + result.file_info.name,
             result.method,
             f"[{conf_style}]{result.confidence:.0%}[/{conf_style}]"
         )
 
+    # Keep the table (and its rendered rows) small for very large plans
+    if len(results) > PLAN_MAX_ROWS:
+        for result in results[:PLAN_EDGE_ROWS]:
+            add_row(result)
+        table.add_row("...", f"and {len(results) - 2 * PLAN_EDGE_ROWS} more files", "", "", "")
+        for result in results[-PLAN_EDGE_ROWS:]:
+            add_row(result)
+    else:
+        for result in results:
+            add_row(result)
+
     console.print(table)
 
 
@@ -153,14 +229,15 @@ def organize_files(results: list[AnalysisResult], output_dir: Path, config: Conf
         console=console
     ) as progress:
         task = progress.add_task("Organizing files...", total=len(results))
+        throttle = _ProgressThrottle(progress, task)
 
-        for result in results:
-            operation = mover.move_file(result)
+        for result, operation in zip(results, mover.iter_organize(results)):
             if operation:
                 operations.append(operation)
             else:
                 skipped += 1
-            progress.update(task, advance=1, description=f"Moving: {result.file_info.name[:40]}...")
+            throttle.tick(f"Moving: {result.file_info.name[:40]}...")
+        throttle.flush()
 
     mover.end_session()
     return operations, skipped
@@ -255,6 +332,18 @@ Examples:
         action="store_true",
         help="Fast mode: skip AI analysis, use only extension/keyword matching"
     )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=DEFAULT_CONFIG.ollama_concurrency,
+        help=f"Parallel Ollama requests (default: {DEFAULT_CONFIG.ollama_concurrency})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Don't read or write the scan and AI caches"
+    )
 
     args = parser.parse_args()
 
@@ -289,7 +378,7 @@ Examples:
     output_dir = args.output.expanduser().resolve() if args.output else source_dir / DEFAULT_CONFIG.output_dir_name
 
     # Setup config
-    config = Config(ollama_model=args.model)
+    config = Config(ollama_model=args.model, ollama_concurrency=max(1, args.workers), use_cache=args.use_cache)
 
     # Mode indicator
     if args.dry_run:
@@ -304,7 +393,9 @@ Examples:
         return 0
 
     # Step 2: Analyze files
-    results = analyze_files(files, config, fast_mode=args.fast)
+    # Reuse earlier AI answers for repeated files, across runs and output directories
+    results = analyze_files(files, config, fast_mode=args.fast,
+                            cache_path=config.analyzer_cache_path if config.use_cache else None)
 
     # Step 3: Display plan
     console.print()
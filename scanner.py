@@ -1,23 +1,29 @@
 """File scanner for discovering and extracting file metadata."""
 
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Iterator
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import os
+import warnings
 
+from cache import ScanCache
 from config import Config, DEFAULT_CONFIG
+from categories import get_category_by_extension
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
-    """Information about a scanned file."""
+    """Information about a scanned file (mutable: content is filled in and released later)."""
     path: Path
     name: str
     extension: str
     size_bytes: int
-    modified_time: datetime
-    created_time: datetime
+    modified_time: float  # Seconds since the epoch (st_mtime)
+    created_time: float  # Seconds since the epoch (st_ctime)
     content: Optional[str] = None
     mime_type: Optional[str] = None
 
@@ -25,21 +31,168 @@ class FileInfo:
     def size_mb(self) -> float:
         return self.size_bytes / (1024 * 1024)
 
+    @property
+    def modified_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.modified_time)
+
+    @property
+    def created_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.created_time)
+
     @property
     def is_text_file(self) -> bool:
-        return self.extension.lower() in DEFAULT_CONFIG.text_extensions
+        return self.extension in DEFAULT_CONFIG.text_extensions  # Already lowercased by the scanner
 
     def __repr__(self) -> str:
         return f"FileInfo({self.name}, {self.size_mb:.2f}MB)"
 
 
+@dataclass
+class CollectedPaths:
+    """Result of a full scan: the files plus totals gathered in the same pass."""
+    files: list[FileInfo] = field(default_factory=list)
+    total_bytes: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.files)
+
+    def add(self, file_info: FileInfo):
+        self.files.append(file_info)
+        self.total_bytes += file_info.size_bytes
+
+
+# Bytes handed to libmagic; file signatures sit well within the first few KB
+_MAGIC_HEAD_BYTES = 4096
+
+# Scan cache rows are written in batches of this many
+_SCAN_CACHE_BATCH = 1000
+
+# MIME types implied by unambiguous extensions; these files skip libmagic
+_KNOWN_EXT_MIME = {
+    '.pdf': 'application/pdf',
+    '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif',
+    '.webp': 'image/webp', '.bmp': 'image/bmp', '.tif': 'image/tiff', '.tiff': 'image/tiff',
+    '.heic': 'image/heic', '.svg': 'image/svg+xml',
+    '.mp4': 'video/mp4', '.m4v': 'video/x-m4v', '.mov': 'video/quicktime', '.mkv': 'video/x-matroska',
+    '.avi': 'video/x-msvideo', '.webm': 'video/webm',
+    '.mp3': 'audio/mpeg', '.wav': 'audio/x-wav', '.flac': 'audio/flac', '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg', '.aac': 'audio/aac',
+    '.zip': 'application/zip', '.gz': 'application/gzip', '.tar': 'application/x-tar',
+    '.7z': 'application/x-7z-compressed', '.rar': 'application/x-rar',
+    '.doc': 'application/msword', '.xls': 'application/vnd.ms-excel',
+    '.ppt': 'application/vnd.ms-powerpoint',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    '.epub': 'application/epub+zip',
+}
+
+
+def _iter_pdf_pages(source) -> Iterator[str]:
+    """Yield page texts one at a time, preferring C-backed PDFium over pure-Python pypdf."""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        from pypdf import PdfReader
+        for page in PdfReader(source).pages:
+            yield page.extract_text() or ""
+        return
+
+    document = pdfium.PdfDocument(source)
+    try:
+        for index in range(len(document)):
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        document.close()
+
+
+def _extract_pdf_text(source, limit: Optional[int]) -> Optional[str]:
+    """Extract (up to ``limit`` characters of) text from a PDF; top-level so worker processes can run it."""
+    pages = _iter_pdf_pages(source)
+    try:
+        text_parts = []
+        total_chars = 0
+
+        for page_text in pages:
+            if limit is not None:
+                page_text = page_text[:limit - total_chars]
+            text_parts.append(page_text)
+            total_chars += len(page_text)
+            if limit is not None and total_chars >= limit:
+                break
+
+        content = "\n".join(text_parts)
+        if limit is not None:
+            content = content[:limit]
+        return content.strip() if content else None
+    except ImportError:
+        return None
+    except Exception:
+        return None
+    finally:
+        pages.close()  # Release the document even when stopping early
+
+
+# Fewer PDFs than this are extracted in-process: starting worker processes (and, under
+# spawn, re-importing this module in each) costs more than a handful of extractions
+_PDF_POOL_MIN_FILES = 16
+
+
+# Directories with more subdirectories than this are walked in parallel
+_PARALLEL_WALK_MIN_SUBDIRS = 4
+
+
+def _list_dir(directory: str) -> tuple[list[tuple[str, os.stat_result]], list[str]]:
+    """List one directory: (path, stat) of its non-hidden files and its non-hidden subdirectories."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    # Don't follow directory symlinks (avoids cycles); symlinked files are kept
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append((entry.path, entry.stat()))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
 class FileScanner:
     """Scans directories and extracts file information."""
 
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, cache_path: Optional[Path] = None):
         self.config = config or DEFAULT_CONFIG
         self._magic = None
 
+        # Details of unchanged files are reused from earlier scans when a cache is given
+        self._cache = ScanCache(cache_path) if cache_path else None
+        self._cache_rows: list[tuple] = []
+        self._deferred_cache_rows: list[tuple[FileInfo, int]] = []  # PDFs awaiting extraction
+        self._prune_roots: list[tuple[str, list[str]]] = []  # (scanned directory, paths found)
+
+        # Content reader per extension, only for files whose content the analyzer may use
+        self._content_readers = {
+            extension: self._read_text
+            for extension in self.config.text_extensions
+            if self.needs_content(extension)
+        }
+        if self.needs_content('.pdf'):
+            self._content_readers['.pdf'] = self._read_pdf
+
     def _get_magic(self):
         """Lazy load python-magic."""
         if self._magic is None:
@@ -50,13 +203,16 @@ class FileScanner:
                 self._magic = False  # Mark as unavailable
         return self._magic if self._magic else None
 
-    def scan_directory(self, directory: Path, recursive: bool = True) -> Iterator[FileInfo]:
+    def scan_directory(self, directory: Path, recursive: bool = True,
+                       defer_pdf: bool = False) -> Iterator[FileInfo]:
         """
         Scan a directory and yield FileInfo objects for each file.
 
         Args:
             directory: Path to scan
             recursive: Whether to scan subdirectories
+            defer_pdf: Leave PDF content unset, to be filled in one parallel
+                pass by ``extract_pdf_contents`` after discovery
 
         Yields:
             FileInfo objects for each file found
@@ -68,26 +224,51 @@ class FileScanner:
         if not directory.is_dir():
             raise ValueError(f"Not a directory: {directory}")
 
-        pattern = "**/*" if recursive else "*"
-
-        for file_path in directory.glob(pattern):
-            if file_path.is_file():
-                # Skip hidden files
-                if file_path.name.startswith('.'):
-                    continue
-
-                # Skip files in hidden directories
-                if any(part.startswith('.') for part in file_path.parts):
-                    continue
-
-                file_info = self._get_file_info(file_path)
-                if file_info:
-                    yield file_info
-
-    def _get_file_info(self, file_path: Path) -> Optional[FileInfo]:
-        """Extract information from a single file."""
+        # A completed recursive scan tells the cache which of its rows under this directory are stale
+        seen = [] if self._cache and recursive else None
+        for path, stat in self._walk(str(directory), recursive):
+            file_path = Path(path)
+            if seen is not None:
+                seen.append(str(file_path))
+            file_info = self._get_file_info(file_path, stat, defer_pdf)
+            if file_info:
+                yield file_info
+        if seen is not None:
+            self._prune_roots.append((str(directory), seen))
+
+    def _walk(self, directory: str, recursive: bool) -> Iterator[tuple[str, os.stat_result]]:
+        """Yield (path, stat) for non-hidden files, skipping hidden directories without entering them."""
+        files, subdirs = _list_dir(directory)
+        yield from files
+        if not recursive:
+            return
+
+        # Small fan-out isn't worth a thread pool; recurse and let each subdir decide
+        if len(subdirs) <= _PARALLEL_WALK_MIN_SUBDIRS:
+            for subdir in subdirs:
+                yield from self._walk(subdir, recursive)
+        else:
+            yield from self._walk_parallel(subdirs)
+
+    def _walk_parallel(self, directories: list[str]) -> Iterator[tuple[str, os.stat_result]]:
+        """Walk whole subtrees on a thread pool; readdir/stat release the GIL."""
+        executor = ThreadPoolExecutor(max_workers=min(32, 4 * (os.cpu_count() or 1)))
         try:
-            stat = file_path.stat()
+            # Consume listings in submission order so the scan order stays deterministic
+            pending = deque(executor.submit(_list_dir, d) for d in directories)
+            while pending:
+                files, subdirs = pending.popleft().result()
+                pending.extend(executor.submit(_list_dir, d) for d in subdirs)
+                yield from files
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _get_file_info(self, file_path: Path, stat: Optional[os.stat_result] = None,
+                       defer_pdf: bool = False) -> Optional[FileInfo]:
+        """Extract information from a single file, reusing its stat result if already known."""
+        try:
+            if stat is None:
+                stat = file_path.stat()
             extension = file_path.suffix.lower()
 
             # Skip files that are too large
@@ -99,75 +280,204 @@ class FileScanner:
             if extension in self.config.skip_extensions:
                 return None
 
-            # Get MIME type if available
-            mime_type = None
-            magic_instance = self._get_magic()
-            if magic_instance:
-                try:
-                    mime_type = magic_instance.from_file(str(file_path))
-                except Exception:
-                    pass
+            # Extract content for text files and PDFs, unless the extension alone decides the category
+            reader = self._content_readers.get(extension)
+            mime_type = _KNOWN_EXT_MIME.get(extension)
+            magic_instance = None if mime_type else self._get_magic()
 
-            # Extract content for text files
-            content = None
-            if extension in self.config.text_extensions:
-                content = self._read_text_content(file_path)
-            elif extension == '.pdf':
-                content = self._read_pdf_content(file_path)
+            # Only a file that would be opened is worth a cache lookup
+            if self._cache and (magic_instance or reader):
+                file_info = self._get_cached_file_info(file_path, stat, extension, reader is not None)
+                if file_info:
+                    return file_info
+
+            deferred = defer_pdf and extension == '.pdf' and reader is not None
+            if deferred:
+                reader = None
 
-            return FileInfo(
+            # Open the file once: its head feeds both MIME sniffing and the content reader
+            content = None
+            opened = False
+            if magic_instance or reader:
+                try:
+                    with open(file_path, 'rb') as f:
+                        opened = True
+                        head = f.read(_MAGIC_HEAD_BYTES)
+                        if magic_instance:
+                            try:
+                                mime_type = magic_instance.from_buffer(head)
+                            except Exception:
+                                pass
+                        if reader:
+                            content = reader(f, head)
+                except OSError:
+                    opened = False  # Unreadable files are still organized, just without content
+
+            file_info = FileInfo(
                 path=file_path,
                 name=file_path.name,
                 extension=extension,
                 size_bytes=stat.st_size,
-                modified_time=datetime.fromtimestamp(stat.st_mtime),
-                created_time=datetime.fromtimestamp(stat.st_ctime),
+                modified_time=stat.st_mtime,
+                created_time=stat.st_ctime,
                 content=content,
                 mime_type=mime_type
             )
+
+            # Remember what opening the file produced; files never opened aren't worth a row
+            if self._cache and (opened or deferred):
+                if deferred:
+                    self._deferred_cache_rows.append((file_info, stat.st_mtime_ns))
+                else:
+                    self._add_cache_row(file_info, stat.st_mtime_ns, reader is not None)
+            return file_info
         except (PermissionError, OSError) as e:
             return None
 
-    def _read_text_content(self, file_path: Path) -> Optional[str]:
-        """Read text content from a file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(self.config.max_content_chars)
-                return content.strip() if content else None
-        except Exception:
+    @property
+    def _cache_chars(self) -> int:
+        """Content limit recorded with cached previews (-1 for unlimited)."""
+        limit = self._content_limit
+        return -1 if limit is None else limit
+
+    def _get_cached_file_info(self, file_path: Path, stat: os.stat_result, extension: str,
+                              wants_content: bool) -> Optional[FileInfo]:
+        """Rebuild FileInfo from the scan cache if the file is unchanged and the entry covers what's needed."""
+        cached = self._cache.get(str(file_path), stat.st_mtime_ns, stat.st_size)
+        if cached is None:
             return None
 
-    def _read_pdf_content(self, file_path: Path) -> Optional[str]:
-        """Extract text content from a PDF file."""
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(str(file_path))
-            text_parts = []
-            total_chars = 0
-
-            for page in reader.pages:
-                page_text = page.extract_text() or ""
-                text_parts.append(page_text)
-                total_chars += len(page_text)
-                if total_chars >= self.config.max_content_chars:
-                    break
-
-            content = "\n".join(text_parts)[:self.config.max_content_chars]
-            return content.strip() if content else None
-        except ImportError:
-            return None
-        except Exception:
-            return None
+        content, mime_type, chars = cached
+        if wants_content and chars != self._cache_chars:
+            return None  # Cached without content, or with a different preview size
+
+        return FileInfo(
+            path=file_path,
+            name=file_path.name,
+            extension=extension,
+            size_bytes=stat.st_size,
+            modified_time=stat.st_mtime,
+            created_time=stat.st_ctime,
+            content=content if wants_content else None,
+            mime_type=mime_type
+        )
+
+    def _add_cache_row(self, file_info: FileInfo, mtime_ns: int, has_content: bool):
+        """Queue a scan cache row, writing out a batch once enough have built up."""
+        self._cache_rows.append((
+            str(file_info.path), mtime_ns, file_info.size_bytes, file_info.content,
+            file_info.mime_type, self._cache_chars if has_content else None
+        ))
+        if len(self._cache_rows) >= _SCAN_CACHE_BATCH:
+            self._cache.put_many(self._cache_rows)
+            self._cache_rows = []
+
+    def _flush_cache(self):
+        """Write queued scan cache rows, including PDFs whose text has now been extracted, and prune stale ones."""
+        if not self._cache:
+            return
+        for file_info, mtime_ns in self._deferred_cache_rows:
+            # A PDF still without content was never extracted; don't record it as textless
+            self._add_cache_row(file_info, mtime_ns, file_info.content is not None)
+        self._deferred_cache_rows = []
+        self._cache.put_many(self._cache_rows)
+        self._cache_rows = []
+        for root, seen in self._prune_roots:
+            self._cache.prune(root, seen)
+        self._prune_roots = []
+
+    def close(self):
+        """
+        Write pending scan cache rows and close the cache.
+
+        Call after ``extract_pdf_contents`` and before analysis releases file
+        content, so the PDF text is cached too.
+        """
+        if self._cache:
+            self._flush_cache()
+            self._cache.close()
+
+    @property
+    def _content_limit(self) -> Optional[int]:
+        """Max characters of content to keep per file, or None for no limit."""
+        return self.config.max_content_chars if self.config.content_preview_only else None
+
+    def _read_text(self, f, head: bytes) -> Optional[str]:
+        """Decode a text file's preview from its already-read head (reading on if the limit needs more)."""
+        limit = self._content_limit
+        # UTF-8 needs at most 4 bytes per character, so this always covers `limit` characters
+        rest = f.read(-1 if limit is None else max(0, 4 * limit - len(head)))
+        content = (head + rest).decode('utf-8', errors='ignore')
+        if limit is not None:
+            content = content[:limit]
+        return content.strip() if content else None
+
+    def _read_pdf(self, f, head: bytes) -> Optional[str]:
+        """Extract a PDF's text from its open handle."""
+        f.seek(0)
+        return self._read_pdf_content(f)
+
+    def _read_pdf_content(self, source) -> Optional[str]:
+        """Extract text content from a PDF (a path or an open binary file)."""
+        return _extract_pdf_text(source, self._content_limit)
+
+    def needs_content(self, extension: str) -> bool:
+        """Check whether the analyzer can use a file's content (rules win for known extensions)."""
+        if self.config.prefer_rules_over_ai and extension not in self.config.ai_only_extensions:
+            return get_category_by_extension(extension) is None
+        return True
+
+    def extract_pdf_contents(self, files: list[FileInfo]):
+        """
+        Fill in content for PDFs deferred by ``scan_directory(defer_pdf=True)``.
+
+        Extraction is CPU-bound pure Python, so it runs in a process pool
+        rather than threads; batches under ``_PDF_POOL_MIN_FILES`` are handled in-process.
+        """
+        pending = [
+            fi for fi in files
+            if fi.extension == '.pdf' and fi.content is None and self.needs_content(fi.extension)
+        ]
+        if not pending:
+            return
+
+        paths = [str(fi.path) for fi in pending]
+        limits = [self._content_limit] * len(pending)
+        workers = min(os.cpu_count() or 1, len(pending))
+
+        contents = None
+        if workers > 1 and len(pending) >= _PDF_POOL_MIN_FILES:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunksize = max(1, min(16, len(pending) // workers))
+                    contents = list(executor.map(_extract_pdf_text, paths, limits, chunksize=chunksize))
+            except (OSError, BrokenProcessPool):
+                contents = None  # No usable process pool here; extract serially instead
+        if contents is None:
+            contents = [_extract_pdf_text(path, limit) for path, limit in zip(paths, limits)]
+
+        for file_info, content in zip(pending, contents):
+            file_info.content = content
+
+    def scan_all(self, directory: Path, recursive: bool = True) -> CollectedPaths:
+        """Scan a directory in one pass, collecting every file (PDF text included) and totals."""
+        collected = CollectedPaths()
+        for file_info in self.scan_directory(directory, recursive, defer_pdf=True):
+            collected.add(file_info)
+        self.extract_pdf_contents(collected.files)
+        self._flush_cache()
+        return collected
 
     def get_file_count(self, directory: Path, recursive: bool = True) -> int:
-        """Get the count of files in a directory."""
-        count = 0
-        for _ in self.scan_directory(directory, recursive):
-            count += 1
-        return count
+        """Get the count of files in a directory (deprecated: walks the whole tree just to count)."""
+        warnings.warn(
+            "get_file_count() is deprecated; use scan_all(directory).count",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return sum(1 for _ in self.scan_directory(directory, recursive, defer_pdf=True))
 
 
 def scan_files(directory: Path, config: Config = None) -> list[FileInfo]:
     """Convenience function to scan all files in a directory."""
-    scanner = FileScanner(config)
-    return list(scanner.scan_directory(directory))
+    return FileScanner(config).scan_all(directory).files
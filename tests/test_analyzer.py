@@ -0,0 +1,162 @@
+"""Tests for the batched analysis pipeline in analyzer.py."""
+
+from pathlib import Path
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import analyzer
+from analyzer import AnalysisResult, FileAnalyzer
+from cache import AnalysisCache
+from config import Config
+from scanner import FileInfo
+
+
+def make_file(name: str, content: str = "some text") -> FileInfo:
+    """A FileInfo for a file that was never on disk."""
+    path = Path("/nowhere") / name
+    return FileInfo(path=path, name=name, extension=path.suffix.lower(), size_bytes=len(content),
+                    modified_time=0.0, created_time=0.0, content=content)
+
+
+class IterAnalyzeTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = FileAnalyzer(Config(), cache_path=None)
+        self.analyzer._needs_ai = lambda file_info: file_info.extension == '.txt'
+        self.batches = []
+
+        def answer_none(files):
+            self.batches.append(len(files))
+            return {}
+        self.analyzer._analyze_batch_with_ai = answer_none
+
+    def test_rare_ai_file_does_not_hold_back_the_stream(self):
+        config = self.analyzer.config
+        bound = 2 * config.ollama_concurrency * config.batch_size + analyzer._MAX_QUEUED_RULE_RESULTS
+        total = 3 * bound
+        consumed = 0
+
+        def stream():
+            nonlocal consumed
+            for i in range(total):
+                consumed += 1
+                yield make_file("notes.txt" if i == 0 else f"photo_{i}.jpg")
+
+        results = self.analyzer.iter_analyze(stream())
+        first = next(results)
+
+        self.assertEqual(first.file_info.name, "notes.txt")
+        self.assertLessEqual(consumed, bound + 2)
+        self.assertEqual(self.batches, [1])  # The half-filled batch went out early
+
+        rest = list(results)
+        self.assertEqual(len(rest), total - 1)
+        self.assertEqual(rest[0].file_info.name, "photo_1.jpg")
+
+    def test_failed_batch_falls_back_to_rules(self):
+        def fail(files):
+            raise RuntimeError("bad batch")
+        self.analyzer._analyze_batch_with_ai = fail
+
+        files = [make_file("invoice_2024.txt"), make_file("a.jpg")]
+        results = list(self.analyzer.iter_analyze(files, release_content=False))
+
+        self.assertEqual([(r.category_key, r.method) for r in results],
+                         [(r.category_key, r.method) for r in map(self.analyzer._analyze_with_rules, files)])
+
+    def test_async_analysis_is_batched_and_off_the_loop(self):
+        threads = []
+
+        def answer_none(files):
+            threads.append(threading.get_ident())
+            self.batches.append(len(files))
+            return {}
+        self.analyzer._analyze_batch_with_ai = answer_none
+        files = [make_file(f"f{i}.txt" if i % 2 == 0 else f"f{i}.jpg") for i in range(50)]
+
+        async def run():
+            return threading.get_ident(), await self.analyzer.analyze_files_async(files)
+        loop_thread, results = asyncio.run(run())
+
+        self.assertEqual([r.file_info.name for r in results], [f.name for f in files])
+        self.assertEqual(self.batches, [10, 10, 5])
+        self.assertNotIn(loop_thread, threads)
+
+    def test_results_keep_input_order(self):
+        files = [make_file(f"f{i}.txt" if i % 3 == 0 else f"f{i}.jpg") for i in range(100)]
+        names = [result.file_info.name for result in self.analyzer.iter_analyze(files)]
+        self.assertEqual(names, [f.name for f in files])
+
+
+class ParseResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = FileAnalyzer(Config(), cache_path=None)
+        self.file = make_file("report.txt")
+
+    def test_non_finite_confidence_is_rejected(self):
+        for confidence in ("nan", "inf", float("nan")):
+            with self.subTest(confidence=confidence):
+                data = {"category": "financial", "confidence": confidence}
+                self.assertIsNone(self.analyzer._parse_ai_response(self.file, data))
+
+    def test_out_of_range_idx_is_skipped(self):
+        for idx in ("1e400", "Infinity", "-Infinity"):
+            with self.subTest(idx=idx):
+                reply = '{"results": [{"idx": %s, "category": "financial"}]}' % idx
+                self.assertEqual(self.analyzer._parse_batch_response([self.file], reply), {})
+
+    def test_bare_nan_from_json_is_rejected(self):
+        reply = '{"results": [{"idx": 0, "category": "financial", "confidence": NaN}]}'
+        self.assertEqual(self.analyzer._parse_batch_response([self.file], reply), {})
+
+
+class AnalysisCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.analyzer = FileAnalyzer(Config(), cache_path=Path(self.tmp.name) / "llm.db")
+        self.addCleanup(self.analyzer.close)
+        self.analyzer._get_client = lambda: object()
+        self.queried = []
+
+    def answer(self, category="financial", confidence=0.9, reasoning="looks like an invoice"):
+        """Have the fake model answer every file with the given classification."""
+        def query(client, files):
+            self.queried.append(len(files))
+            return {idx: AnalysisResult(file_info, category, confidence, reasoning, "ai")
+                    for idx, file_info in enumerate(files)}
+        self.analyzer._query_batch = query
+
+    def test_null_confidence_row_is_a_miss(self):
+        file_info = make_file("invoice.txt")
+        namespace = f"{self.analyzer.config.ollama_model}/v{analyzer.PROMPT_VERSION}/{self.analyzer.config.classify_chars}"
+        key = AnalysisCache.make_key(file_info.content, file_info.extension, namespace)
+        self.analyzer._cache.put_many([(key, "financial", None, "poisoned", "ai")])
+        self.answer()
+
+        result = self.analyzer._analyze_batch_with_ai([file_info])[0]
+
+        self.assertEqual(self.queried, [1])
+        self.assertEqual(result.confidence, 0.9)
+        self.assertEqual(self.analyzer._cache.get(key)[1], 0.9)
+
+    def test_surrogate_in_reasoning_does_not_fail_the_analysis(self):
+        # The stdlib parser turns the JSON escape into a lone surrogate, which SQLite can't take as-is
+        reply = '{"results": [{"idx": 0, "category": "financial", "confidence": 0.9, "reasoning": "bill \\ud835"}]}'
+        self.analyzer._chat = lambda client, files: reply
+        files = [make_file("invoice.txt")]
+
+        with mock.patch.object(analyzer, "orjson", None):
+            first = self.analyzer._analyze_batch_with_ai(files)[0]
+            second = self.analyzer._analyze_batch_with_ai(files)[0]
+
+        self.assertEqual(first.reasoning, "bill \ud835")
+        self.assertTrue(self.analyzer._cache.enabled)
+        self.assertEqual((second.category_key, second.confidence), ("financial", 0.9))
+        self.assertNotEqual(second.reasoning, "AI classification")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Tests for the best-effort SQLite caches in cache.py."""
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from cache import ScanCache
+
+
+class ScanCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ScanCache(Path(self.tmp.name) / "scan.db")
+        self.addCleanup(self.cache.close)
+
+    def test_lone_surrogates_are_stored_not_raised(self):
+        path = "/docs/caf\udce9.txt"  # An undecodable file name, as os.scandir returns it
+        self.cache.put_many([(path, 1, 2, "bad \ud835 text", "text/plain", 4000)])
+
+        content, mime_type, chars = self.cache.get(path, 1, 2)
+
+        self.assertTrue(self.cache.enabled)
+        self.assertTrue(content.startswith("bad ") and content.endswith(" text"))
+        self.assertEqual((mime_type, chars), ("text/plain", 4000))
+
+    def test_unusable_location_disables_the_cache(self):
+        blocker = Path(self.tmp.name) / "a_file"
+        blocker.write_text("")
+        cache = ScanCache(blocker / "scan.db")
+
+        cache.put_many([("/docs/a.txt", 1, 2, "text", "text/plain", 4000)])
+
+        self.assertIsNone(cache.get("/docs/a.txt", 1, 2))
+        self.assertFalse(cache.enabled)
+
+    def test_prune_drops_rows_a_rescan_did_not_see(self):
+        rows = [(path, 1, 2, None, "image/jpeg", None) for path in ("/docs/a.jpg", "/docs/sub/b.jpg", "/other/c.jpg")]
+        self.cache.put_many(rows)
+
+        self.cache.prune("/docs", ["/docs/a.jpg"])
+
+        self.assertIsNotNone(self.cache.get("/docs/a.jpg", 1, 2))
+        self.assertIsNone(self.cache.get("/docs/sub/b.jpg", 1, 2))
+        self.assertIsNotNone(self.cache.get("/other/c.jpg", 1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()